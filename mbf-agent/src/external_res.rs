@@ -1,8 +1,8 @@
 //! Collection of types used to read the BMBF resources repository to fetch core mod information.
-use log::info;
+use log::{info, warn};
 use semver::Version;
 use serde::{de::DeserializeOwned, Deserialize, Serialize};
-use std::{collections::HashMap, fmt::Display, sync, time::Duration};
+use std::{collections::HashMap, fmt::Display, path::{Path, PathBuf}, sync, time::Duration};
 use anyhow::{Context, Result};
 
 
@@ -47,6 +47,10 @@ impl std::error::Error for JsonPullError { }
 
 const CORE_MODS_URL: &str = "https://raw.githubusercontent.com/QuestPackageManager/bs-coremods/main/core_mods.json";
 
+// JSON fetched by `fetch_json` is cached in this directory along with its ETag.
+// (Defined here rather than in main.rs, as this module is also compiled into diff_gen)
+const JSON_CACHE_PATH: &str = "/data/local/tmp/mbf-cache";
+
 // If no data is read for this period of time during a file download, the download will be failed.
 pub const REQUEST_TIMEOUT_READ_SECS: u64 = 20;
 
@@ -63,25 +67,95 @@ pub fn get_agent() -> &'static ureq::Agent {
     })
 }
 
+/// Fetches and parses the JSON at the given URL.
+/// The response is cached on the Quest along with its ETag, so if the resource hasn't changed since it was last fetched,
+/// the server can reply with 304 Not Modified and the cached copy is used instead of downloading it again.
 pub fn fetch_json<T: DeserializeOwned>(from: &str) -> Result<T, JsonPullError> {
-    let response = match get_agent().get(from)
+    let (body_path, etag_path) = get_json_cache_paths(from);
+    let cached_etag = std::fs::read_to_string(&etag_path).ok()
+        .filter(|_| body_path.exists());
+
+    let response = send_json_request(from, cached_etag.as_deref())?;
+    if response.status() == 304 && cached_etag.is_some() {
+        match std::fs::read_to_string(&body_path) {
+            Ok(cached) => return parse_json(&cached),
+            Err(err) => {
+                // The cache is only an optimisation, so rather than failing, forget the ETag and download the JSON in full.
+                warn!("Failed to read cached JSON for {from}, downloading it again: {err}");
+                if let Err(err) = std::fs::remove_file(&etag_path) {
+                    warn!("Failed to remove stale ETag for {from}: {err}");
+                }
+
+                let response = send_json_request(from, None)?;
+                return parse_json(&read_and_cache_response(from, response, &body_path, &etag_path)?);
+            }
+        }
+    }
+
+    parse_json(&read_and_cache_response(from, response, &body_path, &etag_path)?)
+}
+
+// Sends a GET request for JSON, which is conditional on the given ETag if there is one.
+fn send_json_request(from: &str, etag: Option<&str>) -> Result<ureq::Response, JsonPullError> {
+    let mut request = get_agent().get(from);
+    if let Some(etag) = etag {
+        request = request.set("If-None-Match", etag);
+    }
+
+    match request
         .call()
         .context("Failed to GET resource") {
-            Ok(resp) => resp,
-            Err(err) => return Err(JsonPullError::FetchError(err))
-        };
+            Ok(resp) => Ok(resp),
+            Err(err) => Err(JsonPullError::FetchError(err))
+        }
+}
 
+// Reads the body of a JSON response, caching it along with its ETag if the server gave one.
+fn read_and_cache_response(from: &str, response: ureq::Response, body_path: &Path, etag_path: &Path) -> Result<String, JsonPullError> {
+    let etag = response.header("ETag").map(str::to_string);
     let resp_string = match response.into_string() {
         Ok(str) => str,
         Err(err) => return Err(JsonPullError::ParseError(err.into()))
     };
 
-    match serde_json::from_str(&resp_string).context("JSON was invalid") {
+    if let Some(etag) = etag {
+        // Failing to cache the response isn't fatal, it just means we'll download it again next time.
+        if let Err(err) = save_cached_json(body_path, etag_path, &resp_string, &etag) {
+            warn!("Failed to cache JSON from {from}: {err}");
+        }
+    }
+    Ok(resp_string)
+}
+
+fn parse_json<T: DeserializeOwned>(json: &str) -> Result<T, JsonPullError> {
+    match serde_json::from_str(json).context("JSON was invalid") {
         Ok(parsed) => Ok(parsed),
         Err(err) => Err(JsonPullError::ParseError(err.into()))
     }
 }
 
+// Gets the paths that the body and ETag of the JSON at the given URL are cached at.
+fn get_json_cache_paths(url: &str) -> (PathBuf, PathBuf) {
+    let file_stem: String = url.chars()
+        .map(|c| if c.is_ascii_alphanumeric() { c } else { '_' })
+        .collect();
+
+    let cache_dir = Path::new(JSON_CACHE_PATH);
+    (cache_dir.join(format!("{file_stem}.json")), cache_dir.join(format!("{file_stem}.etag")))
+}
+
+fn save_cached_json(body_path: &Path, etag_path: &Path, body: &str, etag: &str) -> Result<()> {
+    std::fs::create_dir_all(JSON_CACHE_PATH)?;
+
+    // Remove the old ETag first, so that it can never be paired with a partially written body.
+    if etag_path.exists() {
+        std::fs::remove_file(etag_path)?;
+    }
+    std::fs::write(body_path, body)?;
+    std::fs::write(etag_path, etag)?;
+    Ok(())
+}
+
 pub fn fetch_core_mods(override_core_mod_url: Option<String>) -> Result<CoreModIndex, JsonPullError> {
     match override_core_mod_url {
         Some(url) => {
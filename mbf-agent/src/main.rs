@@ -12,7 +12,7 @@ use crate::requests::Request;
 use anyhow::{Context, Result};
 use const_format::formatcp;
 use external_res::get_agent;
-use log::{error, info, warn, Level};
+use log::{error, info, warn, Level, LevelFilter};
 use requests::Response;
 use serde::{Deserialize, Serialize};
 use std::{fs::OpenOptions, io::{BufRead, BufReader, Read, Write}, panic, path::Path, process::Command, time::Instant};
@@ -40,6 +40,11 @@ pub const TEMP_PATH: &str = "/data/local/tmp/mbf-tmp";
 pub const DOWNLOAD_ATTEMPTS: u32 = 3;
 // The number of seconds between download progress updates.
 pub const PROGRESS_UPDATE_INTERVAL: f32 = 2.0;
+// The size of the buffer used when copying downloads to disk.
+const COPY_BUFFER_SIZE: usize = 64 * 1024;
+// Log messages less severe than this are not sent to the frontend.
+// (In release builds, the `log` crate also compiles out anything below Info)
+const MAX_LOG_LEVEL: LevelFilter = LevelFilter::Info;
 
 
 pub fn get_apk_path() -> Result<Option<String>> {
@@ -146,7 +151,7 @@ fn copy_stream_progress<T: FnMut(usize) -> ()>(from: &mut impl Read,
     to: &mut impl Write,
     progress: &mut T
     ) -> Result<()> {
-    let mut buffer = vec![0u8; 4096];
+    let mut buffer = vec![0u8; COPY_BUFFER_SIZE];
 
     let mut total_read = 0;
     loop {
@@ -175,7 +180,7 @@ struct ResponseLogger {}
 
 impl log::Log for ResponseLogger {
     fn enabled(&self, metadata: &log::Metadata) -> bool {
-        metadata.level() <= Level::Debug
+        metadata.level() <= MAX_LOG_LEVEL
     }
 
     fn log(&self, record: &log::Record) {
@@ -198,9 +203,14 @@ impl log::Log for ResponseLogger {
 }
 
 fn write_response(response: Response) -> Result<()> {
+    // Serialize the whole message up front so that it reaches stdout in a single write,
+    // rather than many small writes through the line buffer of stdout.
+    let mut message = serde_json::to_vec(&response).context("Failed to serialize response")?;
+    message.push(b'\n');
+
     let mut lock = std::io::stdout().lock();
-    serde_json::to_writer(&mut lock, &response).context("Failed to serialize response")?;
-    writeln!(lock)?;
+    lock.write_all(&message)?;
+    lock.flush()?;
     Ok(())
 }
 
@@ -208,7 +218,7 @@ static LOGGER: ResponseLogger = ResponseLogger {};
 
 fn main() -> Result<()> {
     log::set_logger(&LOGGER).expect("Failed to set up logging");
-    log::set_max_level(log::LevelFilter::Info);
+    log::set_max_level(MAX_LOG_LEVEL);
 
     let mut reader = BufReader::new(std::io::stdin());
     let mut line = String::new();
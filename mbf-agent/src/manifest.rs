@@ -19,7 +19,6 @@ pub struct ManifestInfo {
 
 impl ManifestInfo {
     pub fn read<T: Read + Seek>(reader: &mut AxmlReader<T>) -> Result<Self> {
-        let mut version: Option<String> = None;
         while let Some(event) = reader.read_next_event()? {
             match event {
                 Event::StartElement {
@@ -35,24 +34,22 @@ impl ManifestInfo {
                             .filter(|attr| &*attr.name == "versionName")
                             .next();
     
-                        match version_attr {
+                        // The version is on the root <manifest> element, so there is no need to read the rest of the manifest.
+                        return match version_attr {
                             Some(attr) => match &attr.value {
-                                AttributeValue::String(s) => version = Some(s.to_string()),
-                                _ => return Err(anyhow!("Package version must be a string"))
+                                AttributeValue::String(s) => Ok(Self {
+                                    package_version: s.to_string()
+                                }),
+                                _ => Err(anyhow!("Package version must be a string"))
                             },
-                            None => return Err(anyhow!("No package version attribute"))
+                            None => Err(anyhow!("No package version attribute"))
                         }
                     },
                 _ => {}
             }
         }
 
-        match version {
-            Some(package_version) => Ok(Self {
-                package_version
-            }),
-            None => Err(anyhow!("No useful information found in the manifest"))
-        }
+        Err(anyhow!("No useful information found in the manifest"))
     }
 }
 
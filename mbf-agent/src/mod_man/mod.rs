@@ -1,5 +1,5 @@
 mod manifest;
-use std::{cell::RefCell, collections::{HashMap, HashSet}, fs::File, path::{Path, PathBuf}, rc::Rc};
+use std::{cell::RefCell, collections::{HashMap, HashSet}, fs::File, path::{Path, PathBuf}, rc::Rc, sync};
 
 use jsonschema::JSONSchema;
 use log::{error, info, warn};
@@ -13,6 +13,17 @@ use crate::{download_file_with_attempts, zip::ZipFile, EARLY_MODS_DIR, LATE_MODS
 const QMOD_SCHEMA: &str = include_str!("qmod_schema.json");
 const MAX_SCHEMA_VERSION: Version = Version::new(1, 1, 0);
 
+static SCHEMA: sync::OnceLock<JSONSchema> = sync::OnceLock::new();
+
+// Gets the compiled QMOD schema, compiling it the first time it is needed.
+fn get_schema() -> &'static JSONSchema {
+    SCHEMA.get_or_init(|| {
+        JSONSchema::options()
+            .compile(&serde_json::from_str::<serde_json::Value>(QMOD_SCHEMA).expect("QMOD schema was not valid JSON"))
+            .expect("QMOD schema was not a valid JSON schema")
+    })
+}
+
 pub struct Mod {
     manifest: ModInfo,
     installed: bool,
@@ -32,17 +43,13 @@ impl Mod {
 }
 
 pub struct ModManager {
-    mods: HashMap<String, Rc<RefCell<Mod>>>,
-    schema: JSONSchema
+    mods: HashMap<String, Rc<RefCell<Mod>>>
 }
 
 impl ModManager {
     pub fn new() -> Self {    
         Self {
-            mods: HashMap::new(),
-            schema: JSONSchema::options()
-                .compile(&serde_json::from_str::<serde_json::Value>(QMOD_SCHEMA).expect("QMOD schema was not valid JSON"))
-                .expect("QMOD schema was not a valid JSON schema")
+            mods: HashMap::new()
         }
     }
 
@@ -146,7 +153,7 @@ impl ModManager {
         }
 
         // Now validate against the schema
-        if let Err(errors) = self.schema.validate(&manifest_value) {
+        if let Err(errors) = get_schema().validate(&manifest_value) {
             let mut log_builder = String::new();
 
             for error in errors {
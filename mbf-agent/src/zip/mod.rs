@@ -1,4 +1,4 @@
-use std::{collections::HashMap, fs::File, io::{Cursor, Read, Seek, SeekFrom, Write}, path::Path};
+use std::{collections::HashMap, fs::File, io::{BufWriter, Cursor, Read, Seek, SeekFrom, Write}, path::Path};
 use byteorder::{ReadBytesExt, LE};
 use anyhow::{Result, anyhow, Context};
 use crc::{Crc, Algorithm};
@@ -143,7 +143,8 @@ impl<T: Read + Seek> ZipFile<T> {
 
 // Copies the contents of `from` to `to`, calculating the ZIP CRC-32 of the copied data.
 fn copy_to_with_crc(from: &mut impl Read, to: &mut impl Write) -> Result<u32> {
-    const BUFFER_SIZE: usize = 4096;
+    // Copy in large chunks so the CRC is updated with a few big slices rather than many tiny ones.
+    const BUFFER_SIZE: usize = 64 * 1024;
     let mut buffer = vec![0; BUFFER_SIZE];
 
     let mut crc = ZIP_CRC.digest();
@@ -174,9 +175,10 @@ impl ZipFile<File> {
         contents.seek(SeekFrom::Start(0))?;
         let crc32 = match compression_method {
             FileCompression::Deflate => {
-                let mut encoder = deflate::Encoder::new(&mut self.file);
+                // The encoder emits its output in small pieces, so buffer it to avoid a write call for each one.
+                let mut encoder = deflate::Encoder::new(BufWriter::new(&mut self.file));
                 let crc = copy_to_with_crc(contents, &mut encoder).context("Failed to write/compress file data")?;
-                encoder.finish().into_result()?;
+                encoder.finish().into_result()?.flush()?;
 
                 crc
             },
@@ -1,6 +1,6 @@
 import { AdbSync, AdbSyncWriteOptions, Adb, encodeUtf8 } from '@yume-chan/adb';
 import { ConsumableReadableStream, Consumable, DecodeUtf8Stream, ConcatStringStream } from '@yume-chan/stream-extra';
-import { Request, Response, LogMsg, ModStatus, Mods, ImportedMod, ImportResultType, FixedPlayerData, ImportResult } from "./Messages";
+import { Request, Response, LogMsg, LogLevel, ModStatus, Mods, ImportedMod, ImportResultType, FixedPlayerData, ImportResult } from "./Messages";
 import { ManifestMod, Mod } from './Models';
 import { AGENT_LENGTH, AGENT_SHA1 } from './agent_manifest';
 
@@ -31,17 +31,25 @@ export function logInfo(sink: LogEventSink, msg: string) {
     })
   }
 }
+
+// The SHA1 of the agent last verified to be on each device, keyed by device serial.
+// Used to avoid hashing the agent on the Quest again when the same device is used more than once in a session.
+const verifiedAgentHashes: Map<string, string> = new Map();
+
 export async function prepareAgent(adb: Adb, eventSink: LogEventSink) {
   logInfo(eventSink, "Preparing agent: used to communicate with your Quest.");
 
-  let existingUpToDate = false;
   console.log("Latest agent SHA1 " + AGENT_SHA1);
+  if(verifiedAgentHashes.get(adb.serial) === AGENT_SHA1) {
+    logInfo(eventSink, "Agent is up to date");
+    return;
+  }
 
-  const exsitingSha1 = (await adb.subprocess.spawnAndWait(`sha1sum ${AgentPath} | cut -f 1 -d " "`)).stdout
-    .trim()
-    .toUpperCase();
+  // sha1sum outputs `<hash>  <path>`, or nothing if the agent doesn't exist yet.
+  const sha1sumOutput = (await adb.subprocess.spawnAndWait(`sha1sum ${AgentPath}`)).stdout;
+  const exsitingSha1 = sha1sumOutput.trim().split(/\s+/)[0].toUpperCase();
   console.log("Existing agent SHA1: " + exsitingSha1);
-  existingUpToDate = AGENT_SHA1 == exsitingSha1.trim().toUpperCase();
+  const existingUpToDate = AGENT_SHA1.toUpperCase() === exsitingSha1;
 
   if(existingUpToDate) {
     logInfo(eventSink, "Agent is up to date");
@@ -49,18 +57,26 @@ export async function prepareAgent(adb: Adb, eventSink: LogEventSink) {
     await overwriteAgent(adb, eventSink);
   }
 
+  verifiedAgentHashes.set(adb.serial, AGENT_SHA1);
 }
 
 export async function overwriteAgent(adb: Adb, eventSink: LogEventSink) {
-  const sync = await adb.sync();
   console.group("Downloading and overwriting agent on Quest");
+  // Start the download straight away so that it overlaps with removing the existing agent.
+  logInfo(eventSink, "Downloading agent, this might take a minute if it's not cached")
+  const agentDownload = downloadAgent(eventSink);
+  // If preparing the Quest fails before the download is awaited, the download failing afterwards must not be an unhandled rejection.
+  // (A failed download is still reported when it is awaited below)
+  agentDownload.catch(() => {});
+
+  const sync = await adb.sync();
   try {
     logInfo(eventSink, "Removing existing agent");
     await adb.subprocess.spawnAndWait("rm " + AgentPath)
-    logInfo(eventSink, "Downloading agent, this might take a minute if it's not cached")
-    await saveAgent(sync, eventSink);
+    const agent = await agentDownload;
     logInfo(eventSink, "Writing new agent");
-    await adb.subprocess.spawnAndWait("chmod +x " + AgentPath);
+    // The download has already been checked against AGENT_SHA1, so there is no need to hash the agent again once it is written.
+    await saveAgent(sync, agent);
 
     logInfo(eventSink, "Agent is ready");
   } finally {
@@ -69,15 +85,15 @@ export async function overwriteAgent(adb: Adb, eventSink: LogEventSink) {
   }
 }
 
-async function saveAgent(sync: AdbSync, eventSink: LogEventSink) {
-  const agent: Uint8Array = await downloadAgent(eventSink);
-
+async function saveAgent(sync: AdbSync, agent: Uint8Array) {
   // TODO: properly use readable streams
   const file: ConsumableReadableStream<Uint8Array> = readableStreamBodge(agent);
 
   const options: AdbSyncWriteOptions = {
     filename: AgentPath,
-    file
+    file,
+    // Make the agent executable as it is written, rather than needing a separate `chmod`.
+    permission: 0o755
   };
 
   await sync.write(options);
@@ -121,7 +137,13 @@ async function downloadAgent(eventSink: LogEventSink): Promise<Uint8Array> {
           }
         }
 
-        return allChunks;
+        // Check the agent in memory before it is pushed, so the same bytes are hashed and written without reading them back from the Quest.
+        const downloadedSha1 = await sha1Hex(allChunks.subarray(0, recvLen));
+        if(recvLen === AGENT_LENGTH && downloadedSha1 === AGENT_SHA1.toUpperCase()) {
+          return allChunks;
+        } else  {
+          console.error("Downloaded agent had SHA1 " + downloadedSha1 + " and length " + recvLen + ", expected " + AGENT_SHA1);
+        }
       } else  {
         console.error("Failed to GET agent: status code " + resp.status)
       }
@@ -136,29 +158,30 @@ async function downloadAgent(eventSink: LogEventSink): Promise<Uint8Array> {
   throw new Error("Failed to fetch agent after multiple attempts.\nDid you lose internet connection just after you loaded the site?\n\nIf not, then please report this issue, including a screenshot of the browser console window!");
 }
 
+// Hashes the given data in memory, returning the SHA1 as uppercase hex.
+async function sha1Hex(data: Uint8Array): Promise<string> {
+  const digest = new Uint8Array(await crypto.subtle.digest("SHA-1", data));
+  return Array.from(digest, byte => byte.toString(16).padStart(2, "0")).join("").toUpperCase();
+}
+
+// The console function used to print agent logs of each level, looked up once per message rather than branching on the level.
+const agentLogFunctions: Record<LogLevel, (message: string) => void> = {
+  Error: message => console.error(message),
+  Warn: message => console.warn(message),
+  Info: message => console.info(message),
+  Debug: message => console.debug(message),
+  Trace: message => console.trace(message)
+};
+
 function logFromAgent(log: LogMsg) {
-  switch(log.level) {
-    case 'Error':
-      console.error(log.message);
-      break;
-    case 'Warn':
-      console.warn(log.message);
-      break;
-    case 'Debug':
-      console.debug(log.message);
-      break;
-    case 'Info':
-      console.info(log.message);
-      break;
-    case 'Trace':
-      console.trace(log.message);
-  }
+  agentLogFunctions[log.level](log.message);
 }
 
 async function sendRequest(adb: Adb, request: Request, eventSink: LogEventSink = null): Promise<Response> {
   let command_buffer = encodeUtf8(JSON.stringify(request) + "\n");
 
-  let agentProcess = await adb.subprocess.shell(AgentPath);
+  // The agent is spawned without a PTY: the agent doesn't need one, and a PTY would echo the request back on stdout.
+  let agentProcess = await adb.subprocess.spawn(AgentPath);
 
   const stdin = agentProcess.stdin.getWriter();
   try {
@@ -187,19 +210,20 @@ async function sendRequest(adb: Adb, request: Request, eventSink: LogEventSink =
       continue;
     }
 
-    // TODO: This is fairly inefficient in terms of memory usage
-    // (although we aren't receiving a huge amount of data so this might be OK)
-    buffer += receivedStr;
-    const messages = buffer.split("\n");
-    buffer = messages[messages.length - 1];
+    // Only the newly received data can contain the end of a message, so only this is searched for newlines.
+    // (Re-splitting the whole buffer would rescan a large message each time another chunk of it arrives)
+    let messageStart = 0;
+    let newlineIdx = receivedStr.indexOf("\n");
+    while(newlineIdx !== -1) {
+      const message = buffer + receivedStr.substring(messageStart, newlineIdx);
+      buffer = "";
 
-    for(let i = 0; i < messages.length - 1; i++) {
       // Parse each newline separated message as a Response
       let msg_obj: Response;
       try {
-        msg_obj = JSON.parse(messages[i]) as Response;
+        msg_obj = JSON.parse(message) as Response;
       } catch(e) {
-        throw new Error("Agent message " + messages[i] + " was not valid JSON");
+        throw new Error("Agent message " + message + " was not valid JSON");
       }
       if(msg_obj.type === "LogMsg") {
         const log_obj = msg_obj as LogMsg;
@@ -217,7 +241,11 @@ async function sendRequest(adb: Adb, request: Request, eventSink: LogEventSink =
         // This contains the actual response data
         response = msg_obj;
       }
+
+      messageStart = newlineIdx + 1;
+      newlineIdx = receivedStr.indexOf("\n", messageStart);
     }
+    buffer += receivedStr.substring(messageStart);
   }
   console.groupEnd();
 
@@ -268,31 +296,57 @@ export async function setModStatuses(device: Adb,
 }
 
 
-export async function importFile(device: Adb,
-    file: File,
-    eventSink: LogEventSink = null): Promise<ImportResult> {
-  const sync = await device.sync();
-  const tempPath = "/data/local/tmp/mbf-uploads/" + file.name;
-  try {
-    
-    console.log("Uploading to " + tempPath);
-    // TODO: Properly use readable streams, see readableStreamBodge
-    const fileStream = readableStreamBodge(new Uint8Array(await file.arrayBuffer()))
+const UploadsPath: string = "/data/local/tmp/mbf-uploads/";
+
+// Uploads the given files to the Quest, one after another, over a single sync connection.
+// Returns a promise for the path that each file was uploaded to, in the same order as `files`.
+// Each promise resolves as soon as its file has been written, so a file can be imported while later files are still uploading.
+// The file names must be unique, otherwise later files will overwrite earlier ones.
+export function uploadFiles(device: Adb, files: File[]): Promise<string>[] {
+  const syncPromise = device.sync();
+
+  const uploads: Promise<string>[] = [];
+  let previousUpload: Promise<unknown> = syncPromise;
+  for(const file of files) {
+    // Wait for the previous upload to finish (successfully or not) since the sync connection can only write one file at a time.
+    const upload = previousUpload.catch(() => {}).then(async () => {
+      const sync = await syncPromise;
+      const tempPath = UploadsPath + file.name;
+      console.log("Uploading to " + tempPath);
+      // TODO: Properly use readable streams, see readableStreamBodge
+      const fileStream = readableStreamBodge(new Uint8Array(await file.arrayBuffer()))
+
+      await sync.write({
+        filename: tempPath,
+        file: fileStream
+      })
+      return tempPath;
+    });
+
+    uploads.push(upload);
+    previousUpload = upload;
+  }
 
-    await sync.write({
-      filename: tempPath,
-      file: fileStream
-    })
+  // Close the sync connection once every upload has finished.
+  // Any failure to open the connection is already reported by each upload, so failures here (e.g. if the Quest was disconnected) are only logged.
+  Promise.allSettled(uploads)
+    .then(() => syncPromise)
+    .then(sync => sync.dispose())
+    .catch(e => console.warn("Failed to close upload sync connection", e));
 
-    const response = await sendRequest(device, {
-      'type': 'Import',
-      from_path: tempPath
-    }, eventSink);
+  return uploads;
+}
 
-    return response as ImportResult;
-  } finally {
-    sync.dispose();
-  }
+// Imports a file that was previously uploaded to the given path with `uploadFiles`.
+export async function importUploadedFile(device: Adb,
+    tempPath: string,
+    eventSink: LogEventSink = null): Promise<ImportResult> {
+  const response = await sendRequest(device, {
+    'type': 'Import',
+    from_path: tempPath
+  }, eventSink);
+
+  return response as ImportResult;
 }
 
 export async function importUrl(device: Adb,
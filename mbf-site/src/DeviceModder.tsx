@@ -25,28 +25,53 @@ const isDeveloperUrl: boolean = new URLSearchParams(window.location.search).get(
 // Gets the available versions that have diffs to downgrade, and have core mod support
 // Sorts them with the newest versions first.
 export function GetSortedDowngradableVersions(modStatus: ModStatus): string[] | undefined {
-    return modStatus.core_mods?.downgrade_versions
-        .filter(version => modStatus.core_mods?.supported_versions.includes(version))
-        .sort(CompareBeatSaberVersions)
+    const downgradeVersions = modStatus.core_mods?.downgrade_versions
+        .filter(version => modStatus.core_mods?.supported_versions.includes(version));
+    if(downgradeVersions === undefined) {
+        return undefined;
+    }
+
+    // Parse each version once up front, rather than twice for every comparison made by the sort.
+    return downgradeVersions
+        .map(version => ({ version, segments: ParseBeatSaberVersion(version) }))
+        .sort((a, b) => CompareVersionSegments(a.segments, b.segments))
+        .map(parsed => parsed.version);
+}
+
+// Finds the newest of the given versions, or undefined if there are none.
+export function NewestBeatSaberVersion(versions: string[]): string | undefined {
+    let newest: string | undefined = undefined;
+    let newestSegments: number[] = [];
+    for(const version of versions) {
+        const segments = ParseBeatSaberVersion(version);
+        if(newest === undefined || CompareVersionSegments(segments, newestSegments) < 0) {
+            newest = version;
+            newestSegments = segments;
+        }
+    }
+
+    return newest;
 }
 
-export function CompareBeatSaberVersions(a: string, b: string): number {
-    // Split each version into its segments, period separated,
-    // e.g. 1.13.2 goes to 1, 13 and 2.
-    // We make sure to remove the _ suffix
-    const aSegments = a.split("_")[0].split(".");
-    const bSegments = b.split("_")[0].split(".");
+// Split a version into its segments, period separated,
+// e.g. 1.13.2 goes to 1, 13 and 2.
+// We make sure to remove the _ suffix
+function ParseBeatSaberVersion(version: string): number[] {
+    return version.split("_")[0].split(".").map(segment => Number(segment));
+}
 
+// Compares two parsed versions, giving a negative number if `aSegments` is the newer version.
+function CompareVersionSegments(aSegments: number[], bSegments: number[]): number {
     // Iterate through the segments, from major to minor, until neither version has any more segments.
     for(let segment = 0; segment < Math.max(aSegments.length, bSegments.length); segment++) {
         // Default each segment to 0 if version A/B has terminated before this segment.
         let aSegment = 0;
         let bSegment = 0;
         if(segment < aSegments.length) {
-            aSegment = Number(aSegments[segment]);
+            aSegment = aSegments[segment];
         }
         if(segment < bSegments.length) {
-            bSegment = Number(bSegments[segment]);
+            bSegment = bSegments[segment];
         }
 
         if(aSegment > bSegment) {
@@ -203,8 +228,8 @@ function InstallStatus(props: InstallStatusProps) {
 }
 
 function UpdateInfo({ modStatus, device, quit }: { modStatus: ModStatus, device: Adb, quit: () => void }) {
-    const sortedModdableVersions = modStatus.core_mods?.supported_versions.sort(CompareBeatSaberVersions)!;
-    const newerUpdateExists = modStatus.app_info?.version !== sortedModdableVersions[0];
+    const newestModdableVersion = NewestBeatSaberVersion(modStatus.core_mods!.supported_versions);
+    const newerUpdateExists = modStatus.app_info?.version !== newestModdableVersion;
 
     const [updateWindowOpen, setUpdateWindowOpen] = useState(false);
 
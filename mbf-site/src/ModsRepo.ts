@@ -14,7 +14,20 @@ export interface ModRepoMod {
 
 const repoUrl: string = "https://raw.githubusercontent.com/ComputerElite/ComputerElite.github.io/main/tools/Beat_Saber/mods.json";
 
-export async function loadRepo(): Promise<ModRepo> {
+// The repo is only fetched once per session, as reopening the mod browser would otherwise download it again each time.
+let repoLoad: Promise<ModRepo> | null = null;
+
+export function loadRepo(): Promise<ModRepo> {
+    if(repoLoad === null) {
+        repoLoad = fetchRepo();
+        // Forget failed loads so that trying again actually makes a new request.
+        repoLoad.catch(() => repoLoad = null);
+    }
+
+    return repoLoad;
+}
+
+async function fetchRepo(): Promise<ModRepo> {
     const req = await fetch(repoUrl);
     return (await req.json()) as ModRepo;
 }
\ No newline at end of file
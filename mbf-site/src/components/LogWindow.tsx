@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import '../css/LogWindow.css';
 import { LogMsg } from '../Messages';
 import '../fonts/Consolas.ttf';
@@ -9,21 +9,18 @@ interface LogWindowProps {
 
 // Convenience function to set up the state necessary for a logging window.
 export function useLog(): [events: LogMsg[], addEvent: (event: LogMsg) => void] {
-    // This is a little cursed but gets the job done for now.
-    let [logEvents, setLogEvents] = useState([] as LogMsg[]);
+    // Events are appended to one array that lives for the lifetime of the component,
+    // rather than copying every previous event into a new array each time an event is added.
+    // (This also means that every addEvent, even one from an old render, sees all previous events)
+    const logEvents = useRef([] as LogMsg[]);
+    // Only used to notify react that a new event has been added
+    const [, setEventCount] = useState(0);
 
     return [
-        logEvents,
+        logEvents.current,
         (event) => {
-            // We MUST assign this back to the original variable
-            // otherwise subsequent calls will assume that no events have yet been written
-            // since THEIR logEvents will be the same as in the first call (empty)
-            logEvents = [
-                ...logEvents,
-                event
-            ];
-            // Notify react that a new event has been added
-            setLogEvents(logEvents);
+            logEvents.current.push(event);
+            setEventCount(logEvents.current.length);
         }
     ]
 }
@@ -7,7 +7,7 @@ import { ModCard } from "./ModCard";
 import UploadIcon from '../icons/upload.svg';
 import ToolsIcon from '../icons/tools-icon.svg';
 import '../css/ModManager.css';
-import { importFile, importUrl, removeMod, setModStatuses } from "../Agent";
+import { importUploadedFile, importUrl, removeMod, setModStatuses, uploadFiles } from "../Agent";
 import { toast } from "react-toastify";
 import { ModRepoBrowser } from "./ModRepoBrowser";
 import { ImportResult, ImportResultType, ImportedMod, ModStatus } from "../Messages";
@@ -213,6 +213,9 @@ interface QueuedUrlImport extends QueuedImport {
     type: "Url"
 }
 
+// Imported mods waiting to be installed, keyed by mod ID so that only the latest import of each mod is kept.
+type ModsToInstall = { [id: string]: Mod };
+
 const importQueue: QueuedImport[] = [];
 let isProcessingQueue: boolean = false;
 
@@ -227,9 +230,9 @@ function AddModsMenu(props: ModMenuProps) {
         device
     } = props;
 
-    // Automatically installs a mod when it is imported, or warns the user if it isn't designed for the current game version.
-    // Gives appropriate toasts/reports errors in each case.
-    async function onModImported(result: ImportedMod) {
+    // Queues a mod to be installed automatically when it is imported, or warns the user if it isn't designed for the current game version.
+    // The queued mods are installed together by `installImportedMods` once the current batch of imports is done.
+    function onModImported(result: ImportedMod, toInstall: ModsToInstall) {
         const { installed_mods, imported_id } = result;
         setMods(installed_mods);
 
@@ -238,14 +241,29 @@ function AddModsMenu(props: ModMenuProps) {
         if(versionMismatch) {
             // Don't install a mod by default if its version mismatches: we want the user to understand the consequences
             setError("The mod `" + imported_id + "` was not enabled automatically as it is not designed for game version v" + trimGameVersion(gameVersion) + ".");
+            // An earlier import of this mod may have been queued, but the version now imported is the one that would be installed.
+            delete toInstall[imported_id];
         }   else    {
-            setMods(await setModStatuses(device, { [imported_id]: true }, addLogEvent));
-            toast.success("Successfully downloaded and installed " + imported_id + " v" + imported_mod.version)
+            toInstall[imported_id] = imported_mod;
         }
     }
 
-    // Processes an ImportResult
-    async function onImportResult(importResult: ImportResult) {
+    // Installs all of the given imported mods with a single agent request, rather than one request per mod.
+    // Gives success toasts, but leaves reporting a failure to the caller.
+    async function installImportedMods(toInstall: ModsToInstall) {
+        const mods = Object.values(toInstall);
+        if(mods.length === 0) {
+            return;
+        }
+
+        const changes: { [id: string]: boolean } = {};
+        mods.forEach(mod => changes[mod.id] = true);
+        setMods(await setModStatuses(device, changes, addLogEvent));
+        mods.forEach(mod => toast.success("Successfully downloaded and installed " + mod.id + " v" + mod.version));
+    }
+
+    // Processes an ImportResult, adding any imported mod that should be installed to `toInstall`
+    async function onImportResult(importResult: ImportResult, toInstall: ModsToInstall) {
         const filename = importResult.used_filename;
         const typedResult = importResult.result;
         if(typedResult.type === 'ImportedFileCopy') {
@@ -254,27 +272,47 @@ function AddModsMenu(props: ModMenuProps) {
         }   else if(typedResult.type === 'ImportedSong') {
             toast.success("Successfully imported song " + filename);
         }   else    {
-            await onModImported(typedResult);
+            onModImported(typedResult, toInstall);
         }
     }
 
-    async function handleFileImport(file: File) {
-        try {
-            const importResult = await importFile(device, file, addLogEvent);
-            await onImportResult(importResult);
-        }   catch(e)   {
-            toast.error("Failed to import file: " + e);
+    async function handleFileImports(files: File[], toInstall: ModsToInstall) {
+        // Each file is imported as soon as it has been uploaded, while the remaining files continue uploading.
+        const uploads = uploadFiles(device, files);
+
+        let disconnected = false;
+        device.disconnected.then(() => disconnected = true);
+        for(const upload of uploads) {
+            // The remaining uploads will all fail if the device is disconnected, so don't report each one.
+            if(disconnected) {
+                break;
+            }
+
+            let tempPath: string;
+            try {
+                tempPath = await upload;
+            }   catch(e)   {
+                toast.error("Failed to upload file: " + e);
+                continue;
+            }
+
+            try {
+                const importResult = await importUploadedFile(device, tempPath, addLogEvent);
+                await onImportResult(importResult, toInstall);
+            }   catch(e)   {
+                toast.error("Failed to import file: " + e);
+            }
         }
     }
 
-    async function handleUrlImport(url: string) {
+    async function handleUrlImport(url: string, toInstall: ModsToInstall) {
         if (url.startsWith("file:///")) {
             toast.error("Cannot process dropped file from this source, drag from the file picker instead. (Drag from OperaGX file downloads popup does not work)");
             return;
         }
         try {
             const importResult = await importUrl(device, url, addLogEvent)
-            await onImportResult(importResult);
+            await onImportResult(importResult, toInstall);
         }   catch(e)   {
             toast.error(`Failed to import file: ${e}`);
         }
@@ -295,15 +333,42 @@ function AddModsMenu(props: ModMenuProps) {
         let disconnected = false;
         device.disconnected.then(() => disconnected = true);
         setWorking(true);
+        // Mods imported from the queue are installed together once the queue is empty.
+        const toInstall: ModsToInstall = {};
         while(importQueue.length > 0 && !disconnected) {
             // Process the next import, depending on if it is a URL or file
             const newImport = importQueue.pop()!;
             if(newImport.type == "File") {
-                const file = (newImport as QueuedFileImport).file;
-                await handleFileImport(file);
+                // Upload any other queued files along with this one, so they share one sync connection.
+                // Files with the same name can't be uploaded together, as they would overwrite each other.
+                const files = [(newImport as QueuedFileImport).file];
+                while(importQueue.length > 0 && importQueue[importQueue.length - 1].type == "File") {
+                    const nextFile = (importQueue[importQueue.length - 1] as QueuedFileImport).file;
+                    if(files.some(file => file.name === nextFile.name)) {
+                        break;
+                    }
+
+                    files.push(nextFile);
+                    importQueue.pop();
+                }
+
+                await handleFileImports(files, toInstall);
             }   else    {
                 const url = (newImport as QueuedUrlImport).url;
-                await handleUrlImport(url);
+                await handleUrlImport(url, toInstall);
+            }
+        }
+
+        if(disconnected) {
+            const notInstalled = Object.keys(toInstall);
+            if(notInstalled.length > 0) {
+                toast.error("The device was disconnected before these imported mods could be installed: " + notInstalled.join(", "));
+            }
+        }   else    {
+            try {
+                await installImportedMods(toInstall);
+            }   catch(e)   {
+                toast.error("Failed to install mod: " + e);
             }
         }
         setWorking(false);
@@ -340,7 +405,9 @@ function AddModsMenu(props: ModMenuProps) {
         <ModRepoBrowser existingMods={mods} gameVersion={gameVersion} onDownload={async url => {
             setWorking(true);
             try {
-                await onImportResult(await importUrl(device, url, addLogEvent));
+                const toInstall: ModsToInstall = {};
+                await onImportResult(await importUrl(device, url, addLogEvent), toInstall);
+                await installImportedMods(toInstall);
             }   catch(e) { 
                 setError("Failed to install mod " + e);
             }   finally {
@@ -21,7 +21,7 @@ export function ModRepoBrowser(props: ModRepoBrowserProps) {
         loadRepo()
             .then(repo => setModRepo(repo))
             .catch(_ => setFailedToLoad(true))
-    }, []);
+    }, [attempt]);
 
     if(modRepo === null) {
         if(failedToLoad) {
@@ -66,9 +66,13 @@ interface ModDisplayInfo {
 function prepareModRepoForDisplay(mods: ModRepoMod[],
     existingMods: Mod[]): ModDisplayInfo[] {
     
+    // Index the existing mods once, rather than searching the whole list for every mod in the repo.
+    const existingById: { [id: string]: Mod } = {};
+    existingMods.forEach(existing => existingById[existing.id] = existing);
+
     return mods.map(mod => {
         // Match mods up with the existing loaded mods.
-        const existingInstall = existingMods.find(existing => existing.id === mod.id);
+        const existingInstall: Mod | undefined = existingById[mod.id];
 
         return {
             alreadyInstalled: existingInstall !== undefined,
@@ -78,12 +82,9 @@ function prepareModRepoForDisplay(mods: ModRepoMod[],
     }).filter(mod => mod.needUpdate || !mod.alreadyInstalled) // Skip any mods that are already installed and up to date
     .sort((a, b) => {
         // Show mods that need an update first in the list
-        if(!a.needUpdate && b.needUpdate) {
-            return 1;
-        }
-
-        if(!b.needUpdate && a.needUpdate) {
-            return -1;
+        const updateOrder = Number(b.needUpdate) - Number(a.needUpdate);
+        if(updateOrder !== 0) {
+            return updateOrder;
         }
 
         // Sort the rest of the mods alphabetically